@@ -6,8 +6,11 @@ Replaces heuristic scoring with learned model predictions.
 import torch
 import torch.nn as nn
 import numpy as np
+import functools
 import json
 import logging
+import operator
+import threading
 from pathlib import Path
 from typing import Dict, Optional
 
@@ -43,6 +46,41 @@ class PronunciationScorer(nn.Module):
         return self.model(x)
 
 
+@functools.lru_cache(maxsize=4)
+def _read_model_files(model_dir_str: str):
+    """
+    Read and parse the model files for a directory once per process.
+
+    Repeated scorer constructions reuse the parsed JSON and loaded
+    state_dict without touching disk. Raises FileNotFoundError (which
+    lru_cache does not cache, so later retries re-check the directory)
+    when any required file is absent.
+
+    Returns:
+        Tuple of (model_info, state_dict, scaler_params)
+    """
+    model_dir = Path(model_dir_str)
+
+    model_info_path = model_dir / "model_info.json"
+    if not model_info_path.exists():
+        raise FileNotFoundError(f"Model info not found: {model_info_path}")
+    with open(model_info_path, 'r') as f:
+        model_info = json.load(f)
+
+    model_weights_path = model_dir / "pronunciation_scorer.pth"
+    if not model_weights_path.exists():
+        raise FileNotFoundError(f"Model weights not found: {model_weights_path}")
+    state_dict = torch.load(model_weights_path, map_location='cpu')
+
+    scaler_path = model_dir / "scaler_params.json"
+    if not scaler_path.exists():
+        raise FileNotFoundError(f"Scaler params not found: {scaler_path}")
+    with open(scaler_path, 'r') as f:
+        scaler_params = json.load(f)
+
+    return model_info, state_dict, scaler_params
+
+
 class MLPronunciationScorer:
     """
     ML-based pronunciation scorer that loads trained model
@@ -58,54 +96,142 @@ class MLPronunciationScorer:
         """
         self.model_dir = Path(model_dir)
         self.model = None
+        self._mc_model = None
         self.scaler_mean = None
         self.scaler_scale = None
         self.feature_names = None
+        self._staging = None
+        self._device_input = None
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        self._input_dtype = torch.float32
         
         self._load_model()
     
     def _load_model(self):
         """Load trained model weights and scaler parameters."""
         try:
-            # Load model architecture info
-            model_info_path = self.model_dir / "model_info.json"
-            if not model_info_path.exists():
-                logger.warning(f"Model info not found: {model_info_path}")
+            # Parsed JSON and state_dict are cached per model_dir, so
+            # repeated scorer constructions skip the disk reads
+            try:
+                model_info, state_dict, scaler_params = _read_model_files(str(self.model_dir))
+            except FileNotFoundError as e:
+                logger.warning(str(e))
                 return False
-            
-            with open(model_info_path, 'r') as f:
-                model_info = json.load(f)
-            
+
             # Initialize model architecture
             self.model = PronunciationScorer(
                 input_dim=model_info['input_dim'],
                 hidden_dims=model_info.get('hidden_dims', [128, 64, 32]),
                 dropout=model_info.get('dropout', 0.3)
             ).to(self.device)
-            
-            # Load model weights
-            model_weights_path = self.model_dir / "pronunciation_scorer.pth"
-            if not model_weights_path.exists():
-                logger.warning(f"Model weights not found: {model_weights_path}")
-                return False
-            
-            self.model.load_state_dict(torch.load(model_weights_path, map_location=self.device))
+
+            self.model.load_state_dict(state_dict)
             self.model.eval()
-            
-            # Load scaler parameters
-            scaler_path = self.model_dir / "scaler_params.json"
-            if not scaler_path.exists():
-                logger.warning(f"Scaler params not found: {scaler_path}")
-                return False
-            
-            with open(scaler_path, 'r') as f:
-                scaler_params = json.load(f)
-            
+
             self.scaler_mean = np.array(scaler_params['mean'])
             self.scaler_scale = np.array(scaler_params['scale'])
             self.feature_names = scaler_params['feature_names']
-            
+
+            # The feature order is fixed after load: precompute the lookup
+            # so extraction is a single C-level gather per predict call
+            self._feature_defaults = {name: 0.0 for name in self.feature_names}
+            self._feature_getter = operator.itemgetter(*self.feature_names)
+
+            # Fold the scaler's (x - mean) / scale affine transform into
+            # the first Linear layer (W' = W / scale, b' = b - W' @ mean);
+            # it is constant across all calls, so the per-predict NumPy
+            # normalization pass disappears entirely. Must happen before
+            # quantization and freezing.
+            with torch.no_grad():
+                first = self.model.model[0]
+                scale_t = torch.tensor(
+                    self.scaler_scale, dtype=first.weight.dtype, device=self.device
+                )
+                mean_t = torch.tensor(
+                    self.scaler_mean, dtype=first.weight.dtype, device=self.device
+                )
+                first.weight /= scale_t
+                first.bias -= first.weight @ mean_t
+
+            # On CUDA, run the whole network in FP16: the GEMMs hit
+            # tensor cores and weight/activation bandwidth halves. Done
+            # after the scaler fold so the fold arithmetic stays FP32.
+            # CPU keeps FP32 (and may go INT8 below).
+            if self.device.type == 'cuda':
+                self.model = self.model.half()
+                self._input_dtype = torch.float16
+
+            # Persistent input tensors: feature extraction writes straight
+            # into a (pinned, on CUDA) host staging buffer, and one
+            # device-resident tensor is refilled with an async copy_ per
+            # call - no per-predict allocation and no synchronous H2D
+            # transfer. Prediction runs one request at a time in the
+            # analysis executor, so a single shared buffer is safe.
+            self._staging = torch.empty(
+                1, model_info['input_dim'], dtype=torch.float32,
+                pin_memory=(self.device.type == 'cuda')
+            )
+            self._feature_buf = self._staging.numpy().reshape(-1)
+            # On CPU .to() is a no-op alias, so _device_input is _staging
+            # and predict_score skips the copy entirely
+            self._device_input = self._staging.to(self.device, dtype=self._input_dtype)
+
+            # Keep the eager module for Monte-Carlo dropout (it needs
+            # train() mode, which a frozen graph no longer has).
+            self._mc_model = self.model
+
+            # On CPU, dynamically quantize the Linear stack to INT8. Each
+            # Linear+BatchNorm pair is fused first so BN doesn't sit
+            # between quantized ops. Weight memory drops 4x and the GEMMs
+            # use int8 kernels; skipped when no quantized engine is built.
+            if self.device.type == 'cpu' and torch.backends.quantized.engine != 'none':
+                try:
+                    hidden_dims = model_info.get('hidden_dims', [128, 64, 32])
+                    ln_bn_pairs = [
+                        [f'model.{4 * i}', f'model.{4 * i + 1}']
+                        for i in range(len(hidden_dims))
+                    ]
+                    fused = torch.quantization.fuse_modules(self.model, ln_bn_pairs)
+                    # The scaler fold divides each first-layer weight
+                    # column by that feature's std, so the columns span
+                    # the features' dynamic range (1e3-1e4x). Per-tensor
+                    # int8 would flush the small-magnitude columns to
+                    # zero, silently dropping those features - keep the
+                    # first Linear in FP32 and quantize only the rest.
+                    quantize_names = {
+                        name for name, module in fused.named_modules()
+                        if isinstance(module, nn.Linear) and name != 'model.0'
+                    }
+                    self.model = torch.quantization.quantize_dynamic(
+                        fused, quantize_names, dtype=torch.qint8
+                    )
+                    logger.info("Model dynamically quantized to INT8 for CPU inference")
+                except Exception as e:
+                    logger.warning(f"INT8 quantization failed, keeping FP32 model: {e}")
+
+            # Script + freeze for inference: folds BatchNorm into the
+            # Linear layers and drops Python dispatch from the forward
+            # pass - for a network this small, dispatch overhead dominates.
+            try:
+                scripted = torch.jit.script(self.model)
+                frozen = torch.jit.freeze(scripted)
+                frozen = torch.jit.optimize_for_inference(frozen)
+
+                # Two warmup passes trigger JIT shape specialization now
+                # instead of on the first real request
+                warmup = torch.zeros(
+                    1, model_info['input_dim'],
+                    device=self.device, dtype=self._input_dtype
+                )
+                with torch.inference_mode():
+                    frozen(warmup)
+                    frozen(warmup)
+
+                self.model = frozen
+                logger.info("Model scripted and frozen for inference")
+            except Exception as e:
+                logger.warning(f"TorchScript freeze failed, using eager model: {e}")
+
             logger.info(f"✓ ML model loaded successfully from {self.model_dir}")
             logger.info(f"  Input features: {len(self.feature_names)}")
             logger.info(f"  Device: {self.device}")
@@ -132,29 +258,15 @@ class MLPronunciationScorer:
         Returns:
             NumPy array of features in correct order
         """
-        feature_vector = []
-        
-        for feature_name in self.feature_names:
-            if feature_name in features:
-                feature_vector.append(features[feature_name])
-            else:
-                # Missing feature - use 0 as default
-                logger.warning(f"Missing feature: {feature_name}, using 0")
-                feature_vector.append(0.0)
-        
-        return np.array(feature_vector, dtype=np.float32)
-    
-    def _normalize_features(self, feature_vector: np.ndarray) -> np.ndarray:
-        """
-        Normalize features using stored scaler parameters.
-        
-        Args:
-            feature_vector: Raw feature vector
-            
-        Returns:
-            Normalized feature vector
-        """
-        return (feature_vector - self.scaler_mean) / self.scaler_scale
+        missing = self._feature_defaults.keys() - features.keys()
+        if missing:
+            # Missing features - use 0 as default
+            logger.warning(f"Missing features (using 0): {sorted(missing)}")
+            features = {**self._feature_defaults, **features}
+
+        # Single C-level gather into the preallocated buffer
+        self._feature_buf[:] = self._feature_getter(features)
+        return self._feature_buf
     
     def predict_score(self, features: Dict) -> float:
         """
@@ -171,16 +283,17 @@ class MLPronunciationScorer:
             raise RuntimeError("ML model not loaded. Cannot predict score.")
         
         try:
-            # Extract and normalize features
-            feature_vector = self._extract_feature_vector(features)
-            feature_vector_normalized = self._normalize_features(feature_vector)
-            
-            # Convert to tensor
-            feature_tensor = torch.FloatTensor(feature_vector_normalized).unsqueeze(0).to(self.device)
-            
+            # Extract features straight into the staging buffer; the
+            # scaler is folded into the first Linear layer, so the raw
+            # vector goes directly to the model
+            self._extract_feature_vector(features)
+
+            if self._device_input is not self._staging:
+                self._device_input.copy_(self._staging, non_blocking=True)
+
             # Predict
-            with torch.no_grad():
-                prediction = self.model(feature_tensor).item()
+            with torch.inference_mode():
+                prediction = self.model(self._device_input).item()
             
             # Convert from [0, 1] to [0, 100]
             score = prediction * 100.0
@@ -209,23 +322,26 @@ class MLPronunciationScorer:
             raise RuntimeError("ML model not loaded.")
         
         try:
-            # Enable dropout for uncertainty estimation
-            self.model.train()
-            
+            # Enable dropout for uncertainty estimation (eager model - the
+            # frozen inference graph has dropout baked out)
+            self._mc_model.train()
+
             feature_vector = self._extract_feature_vector(features)
-            feature_vector_normalized = self._normalize_features(feature_vector)
-            feature_tensor = torch.FloatTensor(feature_vector_normalized).unsqueeze(0).to(self.device)
-            
-            predictions = []
-            for _ in range(num_samples):
-                with torch.no_grad():
-                    pred = self.model(feature_tensor).item() * 100.0
-                    predictions.append(pred)
-            
+            feature_tensor = torch.from_numpy(feature_vector).to(
+                self.device, dtype=self._input_dtype
+            ).unsqueeze(0)
+
+            # One forward over a (num_samples, D) batch: dropout masks are
+            # drawn independently per row, so the statistics match the old
+            # sequential loop at the cost of one GEMM instead of
+            # num_samples separate dispatches
+            batch = feature_tensor.expand(num_samples, -1).contiguous()
+            with torch.inference_mode():
+                predictions = self._mc_model(batch).squeeze(-1).cpu().numpy() * 100.0
+
             # Back to eval mode
-            self.model.eval()
-            
-            predictions = np.array(predictions)
+            self._mc_model.eval()
+
             mean_score = np.mean(predictions)
             std_score = np.std(predictions)
             
@@ -247,30 +363,35 @@ class MLPronunciationScorer:
 
 # Global scorer instance
 _ml_scorer = None
+_ml_scorer_lock = threading.Lock()
 
 
 def get_ml_scorer(model_dir: str = "models") -> Optional[MLPronunciationScorer]:
     """
     Get or create global ML scorer instance.
-    
+
     Args:
         model_dir: Directory containing model files
-        
+
     Returns:
         MLPronunciationScorer instance or None if not available
     """
     global _ml_scorer
-    
+
+    # Double-checked locking: a burst of first requests must not trigger
+    # several concurrent weight loads and JIT compilations
     if _ml_scorer is None:
-        try:
-            _ml_scorer = MLPronunciationScorer(model_dir=model_dir)
-            if not _ml_scorer.is_available():
-                logger.warning("ML scorer initialized but model not loaded")
-                _ml_scorer = None
-        except Exception as e:
-            logger.error(f"Failed to initialize ML scorer: {e}")
-            _ml_scorer = None
-    
+        with _ml_scorer_lock:
+            if _ml_scorer is None:
+                try:
+                    scorer = MLPronunciationScorer(model_dir=model_dir)
+                    if scorer.is_available():
+                        _ml_scorer = scorer
+                    else:
+                        logger.warning("ML scorer initialized but model not loaded")
+                except Exception as e:
+                    logger.error(f"Failed to initialize ML scorer: {e}")
+
     return _ml_scorer
 
 
@@ -293,19 +414,14 @@ def predict_pronunciation_score(features: Dict, use_ml: bool = True) -> float:
             except Exception as e:
                 logger.warning(f"ML prediction failed, falling back to heuristic: {e}")
     
-    # Fallback to heuristic scoring
-    from inference import PronunciationAnalyzer
-    analyzer = PronunciationAnalyzer()
-    
-    # Get heuristic score (returns 0-1, convert to 0-100)
-    heuristic_score = 0.7  # Base score
-    
-    # Simple heuristic based on available features
-    if 'pitch_mean' in features and features['pitch_mean'] > 0:
-        heuristic_score += 0.1
-    if 'formants' in features and features['formants'].get('F1', 0) > 0:
-        heuristic_score += 0.1
-    if 'energy_mean' in features and features['energy_mean'] > 0.01:
-        heuristic_score += 0.1
-    
+    # Fallback to heuristic scoring: 0.7 base plus 0.1 for each feature
+    # that looks plausible. Branchless bool arithmetic with dict.get
+    # defaults keeps this a single expression on the hot fallback path.
+    heuristic_score = (
+        0.7
+        + 0.1 * (features.get('pitch_mean', 0) > 0)
+        + 0.1 * (features.get('formants', {}).get('F1', 0) > 0)
+        + 0.1 * (features.get('energy_mean', 0) > 0.01)
+    )
+
     return heuristic_score * 100.0
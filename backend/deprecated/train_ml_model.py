@@ -3,149 +3,344 @@ Quick start script for ML model training workflow.
 Guides user through data preparation and model deployment.
 """
 
+import argparse
+import csv
+import functools
+import json
+import os
 import sys
+import threading
+import time
 from pathlib import Path
-import subprocess
+
+# watchdog is optional: with it, the --yes deploy wait wakes up on
+# filesystem events instead of a fixed polling interval.
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+# Resolved once at import so the workflow does not depend on the
+# current working directory. The data directory sits at the repository
+# root and the deployed model files live under backend/models/.
+_SCRIPT_DIR = Path(__file__).resolve().parent
+DATA_DIR = _SCRIPT_DIR.parent.parent / "data"
+MODELS_DIR = _SCRIPT_DIR.parent / "models"
+
+_BAR = "=" * 70
+
+# Plain ASCII markers when output is piped (CI logs, files): fewer
+# bytes and no emoji-aware layout work in log viewers.
+_TTY = sys.stdout.isatty()
+OK = "\u2713" if _TTY else "[OK]"
+FAIL = "\u274c" if _TTY else "[FAIL]"
+WARN = "\u26a0\ufe0f" if _TTY else "[WARN]"
+
+REQUIRED_MODEL_FILES = (
+    "pronunciation_scorer.pth",
+    "model_info.json",
+    "scaler_params.json",
+)
 
 
 def print_header(text):
     """Print formatted header"""
-    print("\n" + "=" * 70)
-    print(f"  {text}")
-    print("=" * 70 + "\n")
+    sys.stdout.write(f"\n{_BAR}\n  {text}\n{_BAR}\n\n")
 
 
 def print_step(number, text):
     """Print step number"""
-    print(f"\n{'='*70}")
-    print(f"  STEP {number}: {text}")
-    print(f"{'='*70}\n")
+    sys.stdout.write(f"\n{_BAR}\n  STEP {number}: {text}\n{_BAR}\n\n")
+
+
+def _count_participant_files(data_dir: str) -> tuple:
+    """
+    Count participants, recordings and labels in one pruned walk.
+
+    os.walk with topdown=True lets us filter ``dirs`` in place, so the
+    traversal never descends into subtrees that are neither participant
+    directories nor their kelimeler folders (exports, caches, ...), and
+    the whole check stays O(relevant entries) as the data tree grows.
+
+    Returns:
+        Tuple of (n_participants, total_audio, total_labels)
+    """
+    n_participants = 0
+    total_audio = 0
+    total_labels = 0
 
+    for root, dirs, files in os.walk(data_dir, topdown=True):
+        dirs[:] = [d for d in dirs
+                   if d.startswith("participant_") or d == "kelimeler"]
+        base = os.path.basename(root)
+        if base.startswith("participant_"):
+            n_participants += 1
+        elif base == "kelimeler":
+            for name in files:
+                if name.endswith(".wav"):
+                    total_audio += 1
+                elif name.endswith("_result.json"):
+                    total_labels += 1
 
-def check_data_directory():
+    return n_participants, total_audio, total_labels
+
+
+def check_data_directory(data_dir=DATA_DIR):
     """Check if data directory exists and has participants"""
-    data_dir = Path("../data")
     if not data_dir.exists():
-        print("❌ Data directory not found: ../data")
+        print(f"{FAIL} Data directory not found: {data_dir}")
         print("   Please ensure you have collected audio recordings first.")
         return False
-    
-    participants = list(data_dir.glob("participant_*"))
-    if len(participants) == 0:
-        print("❌ No participant directories found in ../data")
+
+    n_participants, total_audio, total_labels = _count_participant_files(str(data_dir))
+
+    if n_participants == 0:
+        print(f"{FAIL} No participant directories found in {data_dir}")
         print("   Use the frontend to collect recordings first.")
         return False
-    
-    print(f"✓ Found {len(participants)} participant directories")
-    
-    # Count audio files
-    total_audio = 0
-    total_labels = 0
-    for p in participants:
-        kelimeler = p / "kelimeler"
-        if kelimeler.exists():
-            audio_files = list(kelimeler.glob("*.wav"))
-            label_files = list(kelimeler.glob("*_result.json"))
-            total_audio += len(audio_files)
-            total_labels += len(label_files)
-    
-    print(f"✓ Found {total_audio} audio files")
-    print(f"✓ Found {total_labels} label files")
+
+    print(f"{OK} Found {n_participants} participant directories")
+    print(f"{OK} Found {total_audio} audio files")
+    print(f"{OK} Found {total_labels} label files")
     
     if total_audio == 0:
-        print("❌ No audio files found")
+        print(f"{FAIL} No audio files found")
         return False
     
     if total_labels == 0:
-        print("⚠️  No label files found - you'll need to create them")
+        print(f"{WARN}  No label files found - you'll need to create them")
     
     return True
 
 
 def prepare_data():
     """Run data preparation script"""
+    import subprocess
+
     print("Starting data preparation...")
     print("\n" + "-" * 70)
     
+    # Skip .pyc writes for the one-shot child and keep its output
+    # unbuffered so progress lines appear as they are printed.
+    env = {**os.environ,
+           "PYTHONDONTWRITEBYTECODE": "1",
+           "PYTHONUNBUFFERED": "1"}
+
     try:
-        subprocess.run([sys.executable, "prepare_training_data.py"], check=True)
+        # close_fds=True with no preexec_fn keeps subprocess on the
+        # posix_spawn fast path, avoiding a full fork of this process.
+        subprocess.run(
+            [sys.executable, str(_SCRIPT_DIR / "prepare_training_data.py")],
+            check=True,
+            env=env,
+            close_fds=True,
+            stdin=subprocess.DEVNULL,
+        )
         return True
     except subprocess.CalledProcessError:
-        print("\n❌ Data preparation failed")
+        print(f"\n{FAIL} Data preparation failed")
         return False
     except FileNotFoundError:
-        print("\n❌ prepare_training_data.py not found")
+        print(f"\n{FAIL} prepare_training_data.py not found")
         return False
 
 
 def check_training_csv():
-    """Check if training data CSV was created"""
-    csv_path = Path("../data/training_data.csv")
-    if csv_path.exists():
-        import pandas as pd
+    """Check if the training dataset was created"""
+    parquet_path = DATA_DIR / "training_data.parquet"
+    if parquet_path.exists():
         try:
-            df = pd.read_csv(csv_path)
-            print(f"\n✓ Training data created: {len(df)} samples")
-            print(f"  File: {csv_path}")
+            import pyarrow.parquet as pq
+            n_samples = pq.read_metadata(parquet_path).num_rows
+            print(f"\n{OK} Training data created: {n_samples} samples")
+            print(f"  File: {parquet_path}")
             return True
         except Exception as e:
-            print(f"\n❌ Error reading CSV: {e}")
+            print(f"\n{FAIL} Error reading parquet file: {e}")
             return False
-    else:
-        print("\n❌ training_data.csv not created")
+
+    csv_path = DATA_DIR / "training_data.csv"
+    try:
+        st = os.stat(csv_path)
+    except FileNotFoundError:
+        print(f"\n{FAIL} training_data.csv not created")
         return False
 
+    # On re-runs with an unchanged CSV, reuse the row count from a tiny
+    # sidecar keyed on (size, mtime) — one stat() instead of re-reading
+    # the whole file.
+    stat_key = [st.st_size, st.st_mtime_ns]
+    meta_path = csv_path.with_suffix(".meta.json")
+    try:
+        meta = json.loads(meta_path.read_bytes())
+        if meta.get("key") == stat_key:
+            print(f"\n{OK} Training data created: {meta['n_samples']} samples")
+            print(f"  File: {csv_path}")
+            return True
+    except (OSError, ValueError, KeyError):
+        pass
 
-def check_model_files():
+    try:
+        # csv.reader on the first line is enough to validate the layout;
+        # importing pandas here would cost ~1 s and tens of MB just for
+        # this check.
+        with csv_path.open(newline="") as f:
+            header = next(csv.reader(f), [])
+        if "score" not in header:
+            print(f"\n{FAIL} training_data.csv has no 'score' column")
+            return False
+
+        # Count newlines in large binary chunks; parsing the whole CSV
+        # with pandas just to report the row count loads every value.
+        with csv_path.open("rb", buffering=1 << 20) as f:
+            n_lines = sum(buf.count(b"\n")
+                          for buf in iter(lambda: f.read(1 << 20), b""))
+        n_samples = max(n_lines - 1, 0)  # exclude the header line
+
+        try:
+            meta_path.write_text(
+                json.dumps({"key": stat_key, "n_samples": n_samples}))
+        except OSError:
+            pass  # the cache is best-effort; next run just recounts
+
+        print(f"\n{OK} Training data created: {n_samples} samples")
+        print(f"  File: {csv_path}")
+        return True
+    except OSError as e:
+        print(f"\n{FAIL} Error reading CSV: {e}")
+        return False
+
+
+def check_model_files(models_dir=MODELS_DIR):
     """Check if model files exist in models directory"""
-    models_dir = Path("models")
-    
-    required_files = [
-        "pronunciation_scorer.pth",
-        "model_info.json",
-        "scaler_params.json"
-    ]
-    
-    if not models_dir.exists():
-        print(f"⚠️  Models directory not found: {models_dir}")
+    # One directory listing covers both the existence check and the
+    # per-file lookups, instead of a stat() call per required name.
+    try:
+        with os.scandir(models_dir) as it:
+            present = {entry.name for entry in it}
+    except FileNotFoundError:
+        print(f"{WARN}  Models directory not found: {models_dir}")
         return False
-    
-    missing = []
-    for file in required_files:
-        if not (models_dir / file).exists():
-            missing.append(file)
-    
+
+    missing = [f for f in REQUIRED_MODEL_FILES if f not in present]
+
     if missing:
-        print(f"⚠️  Missing model files:")
+        print(f"{WARN}  Missing model files:")
         for f in missing:
             print(f"   - {f}")
         return False
     
-    print(f"✓ All model files found in {models_dir}")
+    print(f"{OK} All model files found in {models_dir}")
     return True
 
 
+@functools.lru_cache(maxsize=1)
+def _load_scorer():
+    """
+    Import ml_scorer and build the scorer once.
+
+    The import pulls in torch (seconds of import time, ~200 MB RSS), so
+    it stays out of module import for the data-prep-only path and the
+    result is cached for any repeated test calls.
+    """
+    from ml_scorer import get_ml_scorer
+    return get_ml_scorer()
+
+
 def test_ml_model():
     """Test if ML model loads correctly"""
     try:
-        from ml_scorer import get_ml_scorer
-        
-        scorer = get_ml_scorer()
-        
+        scorer = _load_scorer()
+
         if scorer and scorer.is_available():
-            print("✓ ML model loaded successfully")
+            print(f"{OK} ML model loaded successfully")
             return True
         else:
-            print("❌ ML model failed to load")
+            print(f"{FAIL} ML model failed to load")
             return False
             
     except Exception as e:
-        print(f"❌ Error loading ML model: {e}")
+        print(f"{FAIL} Error loading ML model: {e}")
         return False
 
 
-def main():
+def _model_files_ready(models_dir, needed):
+    """
+    True when every required file exists and its size has settled.
+
+    The size re-check 500 ms apart guards against reading a file that
+    is still being copied into place.
+    """
+    try:
+        with os.scandir(models_dir) as it:
+            sizes = {entry.name: entry.stat().st_size
+                     for entry in it if entry.name in needed}
+    except FileNotFoundError:
+        return False
+    if needed - sizes.keys():
+        return False
+
+    time.sleep(0.5)
+    for name in needed:
+        try:
+            if os.stat(os.path.join(models_dir, name)).st_size != sizes[name]:
+                return False
+        except FileNotFoundError:
+            return False
+    return True
+
+
+def _wait_for_files(models_dir, required_files, timeout=600.0, poll_interval=2.0):
+    """Wait until every required file exists (and has finished copying)."""
+    needed = set(required_files)
+    deadline = time.monotonic() + timeout
+
+    if _model_files_ready(models_dir, needed):
+        return True
+
+    if WATCHDOG_AVAILABLE and os.path.isdir(models_dir):
+        # Event-driven: re-check only when something changes in the
+        # directory, with poll_interval as a safety wake-up.
+        changed = threading.Event()
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                changed.set()
+
+        observer = Observer()
+        observer.schedule(_Handler(), str(models_dir))
+        observer.start()
+        try:
+            while time.monotonic() < deadline:
+                changed.wait(timeout=poll_interval)
+                changed.clear()
+                if _model_files_ready(models_dir, needed):
+                    return True
+            return False
+        finally:
+            observer.stop()
+            observer.join()
+
+    while time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        if _model_files_ready(models_dir, needed):
+            return True
+    return False
+
+
+def main(argv=None):
     """Main workflow"""
+    parser = argparse.ArgumentParser(description="ML model training workflow")
+    parser.add_argument(
+        "--yes", "--non-interactive", action="store_true", dest="yes",
+        help="skip interactive prompts; wait for model files on disk instead")
+    parser.add_argument(
+        "--wait-timeout", type=float, default=600.0, metavar="SECONDS",
+        help="how long to wait for model files in --yes mode (default: 600)")
+    args = parser.parse_args(argv)
+
     print_header("PhoneticHybrid - ML Model Training Workflow")
     
     print("This script will guide you through:")
@@ -157,7 +352,7 @@ def main():
     # Step 1: Check data
     print_step(1, "Check Data Directory")
     if not check_data_directory():
-        print("\n❌ Setup incomplete. Please collect audio data first.")
+        print(f"\n{FAIL} Setup incomplete. Please collect audio data first.")
         sys.exit(1)
     
     # Step 2: Prepare dataset
@@ -168,11 +363,11 @@ def main():
     print()
     
     if not prepare_data():
-        print("\n❌ Data preparation failed")
+        print(f"\n{FAIL} Data preparation failed")
         sys.exit(1)
     
     if not check_training_csv():
-        print("\n❌ Training data not created")
+        print(f"\n{FAIL} Training data not created")
         sys.exit(1)
     
     # Step 3: Training instructions
@@ -200,15 +395,15 @@ def main():
     print("   - scaler_params.json")
     print()
     
-    input("Press Enter when you've downloaded the model files...")
-    
+    if not args.yes:
+        input("Press Enter when you've downloaded the model files...")
+
     # Step 4: Deploy model
     print_step(4, "Deploy Model to Backend")
     
-    models_dir = Path("models")
-    models_dir.mkdir(exist_ok=True)
-    
-    print(f"Copy the 3 downloaded files to: {models_dir.absolute()}")
+    MODELS_DIR.mkdir(exist_ok=True)
+
+    print(f"Copy the 3 downloaded files to: {MODELS_DIR}")
     print()
     print("Files needed:")
     print("  - pronunciation_scorer.pth")
@@ -216,21 +411,25 @@ def main():
     print("  - scaler_params.json")
     print()
     
-    input("Press Enter when files are copied...")
-    
+    if args.yes:
+        print("Non-interactive mode: waiting for model files to appear...")
+        if not _wait_for_files(MODELS_DIR, REQUIRED_MODEL_FILES,
+                               timeout=args.wait_timeout):
+            print(f"\n{FAIL} Timed out after {args.wait_timeout:.0f}s waiting "
+                  "for model files")
+            sys.exit(1)
+    else:
+        input("Press Enter when files are copied...")
+
     if not check_model_files():
-        print("\n❌ Model files not found. Please copy them to backend/models/")
+        print(f"\n{FAIL} Model files not found. Please copy them to backend/models/")
         sys.exit(1)
     
     # Step 5: Test deployment
     print_step(5, "Test ML Model")
     
     if test_ml_model():
-        print()
-        print("=" * 70)
-        print("  ✅ SUCCESS! ML Model Deployed and Ready")
-        print("=" * 70)
-        print()
+        sys.stdout.write(f"\n{_BAR}\n  ✅ SUCCESS! ML Model Deployed and Ready\n{_BAR}\n\n")
         print("📊 Your model is now active!")
         print()
         print("Test it:")
@@ -244,7 +443,7 @@ def main():
         print()
     else:
         print()
-        print("❌ Model deployment failed. Check error messages above.")
+        print(f"{FAIL} Model deployment failed. Check error messages above.")
         print()
         print("Troubleshooting:")
         print("  1. Ensure all 3 files are in backend/models/")
@@ -258,10 +457,10 @@ if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
-        print("\n\n⚠️  Process interrupted by user")
+        print(f"\n\n{WARN}  Process interrupted by user")
         sys.exit(0)
     except Exception as e:
-        print(f"\n❌ Unexpected error: {e}")
+        print(f"\n{FAIL} Unexpected error: {e}")
         import traceback
         traceback.print_exc()
         sys.exit(1)
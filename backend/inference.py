@@ -12,6 +12,7 @@ import parselmouth
 from parselmouth.praat import call
 from typing import Dict, List, Tuple, Optional
 import logging
+import threading
 from pathlib import Path
 import os
 
@@ -22,21 +23,30 @@ logger = logging.getLogger(__name__)
 # Load Whisper model once at module level (one-time initialization)
 # This prevents reloading the model on each function call, improving performance
 _whisper_model = None
+_whisper_model_lock = threading.Lock()
+
+# transcribe() registers kv-cache forward hooks on the shared decoder
+# modules, so concurrent calls on one model corrupt each other's caches.
+# Every transcribe call must hold this lock; the librosa/Praat part of
+# the analysis can still run in parallel across pool threads.
+_whisper_transcribe_lock = threading.Lock()
 
 def _get_whisper_model():
-    """Lazy load Whisper model on first use."""
+    """Lazy load Whisper model on first use (thread-safe)."""
     global _whisper_model
     if _whisper_model is None:
-        try:
-            import whisper
-            logger.info("Loading Whisper model (base) - this may take a minute on first run...")
-            _whisper_model = whisper.load_model("base")
-            logger.info("Whisper model loaded successfully")
-        except ImportError:
-            raise ImportError("openai-whisper not installed. Install with: pip install openai-whisper")
-        except Exception as e:
-            logger.error(f"Failed to load Whisper model: {e}")
-            raise
+        with _whisper_model_lock:
+            if _whisper_model is None:
+                try:
+                    import whisper
+                    logger.info("Loading Whisper model (base) - this may take a minute on first run...")
+                    _whisper_model = whisper.load_model("base")
+                    logger.info("Whisper model loaded successfully")
+                except ImportError:
+                    raise ImportError("openai-whisper not installed. Install with: pip install openai-whisper")
+                except Exception as e:
+                    logger.error(f"Failed to load Whisper model: {e}")
+                    raise
     return _whisper_model
 
 
@@ -70,20 +80,29 @@ class PronunciationAnalyzer:
             'ø': {'F1': 450, 'F2': 1500},
         }
     
-    def extract_acoustic_features(self, audio_path: str) -> Dict:
+    def extract_acoustic_features(self, audio, sr: Optional[int] = None) -> Dict:
         """
-        Extract comprehensive acoustic features from audio file.
-        
+        Extract comprehensive acoustic features from audio.
+
         Args:
-            audio_path: Path to .wav audio file
-            
+            audio: Path to a .wav file, or an already-loaded mono float array
+            sr: Sample rate of `audio` when passing an array (ignored for paths)
+
         Returns:
             Dictionary containing MFCCs, pitch, formants, energy, duration
         """
         try:
-            # Load audio with librosa
-            y, sr = librosa.load(audio_path, sr=self.sample_rate)
-            duration = librosa.get_duration(y=y, sr=sr)
+            if isinstance(audio, np.ndarray):
+                # Audio already decoded in memory - avoid a disk round-trip
+                y = audio
+                sr = sr or self.sample_rate
+                if sr != self.sample_rate:
+                    y = librosa.resample(y, orig_sr=sr, target_sr=self.sample_rate)
+                    sr = self.sample_rate
+            else:
+                # Load audio with librosa
+                y, sr = librosa.load(audio, sr=self.sample_rate)
+            duration = len(y) / sr
             
             # 1. Extract MFCCs (Mel-frequency cepstral coefficients)
             mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=self.n_mfcc)
@@ -101,7 +120,7 @@ class PronunciationAnalyzer:
             pitch_std = np.std(f0_clean) if len(f0_clean) > 0 else 0
             
             # 3. Extract formants using Praat (more accurate for phonetics)
-            formants = self._extract_formants_praat(audio_path)
+            formants = self._extract_formants_praat(y, sr)
             
             # 4. Extract energy (RMS)
             rms = librosa.feature.rms(y=y)[0]
@@ -127,26 +146,28 @@ class PronunciationAnalyzer:
                 'zero_crossing_rate': float(zero_crossing_rate),
             }
             
-            logger.info(f"Extracted features from {audio_path}: duration={duration:.2f}s, pitch={pitch_mean:.1f}Hz")
+            logger.info(f"Extracted features: duration={duration:.2f}s, pitch={pitch_mean:.1f}Hz")
             return features
             
         except Exception as e:
             logger.error(f"Feature extraction failed: {e}")
             raise
     
-    def _extract_formants_praat(self, audio_path: str) -> Dict:
+    def _extract_formants_praat(self, y: np.ndarray, sr: int) -> Dict:
         """
         Extract formant frequencies (F1, F2, F3) using Praat.
-        
+
         Args:
-            audio_path: Path to audio file
-            
+            y: Mono audio samples
+            sr: Sample rate of the audio
+
         Returns:
             Dictionary with formant values
         """
         try:
-            # Load sound with Parselmouth (Praat Python wrapper)
-            sound = parselmouth.Sound(audio_path)
+            # Build the Praat Sound from the in-memory samples instead of
+            # re-decoding the file from disk
+            sound = parselmouth.Sound(y.astype(np.float64), sampling_frequency=sr)
             
             # Create Formant object
             formant = call(sound, "To Formant (burg)", 0.0, 5, 5500, 0.025, 50)
@@ -395,7 +416,7 @@ def batch_analyze(audio_files: List[Tuple[str, str, str]]) -> List[Dict]:
     return results
 
 
-def analyze_pronunciation_whisper(audio_path: str, word: str) -> Dict:
+def analyze_pronunciation_whisper(audio: np.ndarray, word: str, sr: int = 16000) -> Dict:
     """
     Analyze pronunciation using Whisper (OpenAI open-source) combined with phoneme alignment.
 
@@ -406,8 +427,9 @@ def analyze_pronunciation_whisper(audio_path: str, word: str) -> Dict:
     4. Phoneme alignment for segment-level scores
 
     Args:
-        audio_path: Path to recorded .wav audio file
+        audio: Recorded audio as a mono float32 array (decoded by the caller)
         word: Target word being pronounced
+        sr: Sample rate of `audio` (Whisper expects 16 kHz)
 
     Returns:
         Dictionary with comprehensive analysis results:
@@ -432,10 +454,16 @@ def analyze_pronunciation_whisper(audio_path: str, word: str) -> Dict:
         from scipy.spatial.distance import euclidean
         from scipy.signal import resample
 
-        logger.info(f"Starting Whisper-based analysis for word='{word}', audio='{audio_path}'")
+        logger.info(f"Starting Whisper-based analysis for word='{word}'")
+
+        # Whisper and the feature extractors both expect 16 kHz mono
+        if sr != 16000:
+            audio = librosa.resample(audio, orig_sr=sr, target_sr=16000)
+            sr = 16000
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
 
         # Step 1: Recognize speech using Whisper
-        recognized_text, whisper_confidence = _recognize_speech_whisper(audio_path, word)
+        recognized_text, whisper_confidence = _recognize_speech_whisper(audio, word)
         logger.info(f"Whisper recognition: '{recognized_text}' (confidence: {whisper_confidence:.2f})")
 
         # Step 2: Generate target phoneme sequence using Phonemizer
@@ -444,7 +472,7 @@ def analyze_pronunciation_whisper(audio_path: str, word: str) -> Dict:
 
         # Step 3: Extract acoustic features
         analyzer = PronunciationAnalyzer()
-        features = analyzer.extract_acoustic_features(audio_path)
+        features = analyzer.extract_acoustic_features(audio, sr)
 
         # Step 3.5: Validate audio quality and word matching
         validation_passed, validation_score, validation_message = _validate_pronunciation_attempt(
@@ -476,7 +504,6 @@ def analyze_pronunciation_whisper(audio_path: str, word: str) -> Dict:
 
         # Step 4: Compute phoneme-wise alignment and scoring
         segment_scores = _compute_phoneme_alignment_scores(
-            audio_path=audio_path,
             target_phonemes=target_phonemes,
             features=features,
             recognized_text=recognized_text
@@ -599,13 +626,13 @@ def _validate_pronunciation_attempt(
     return True, validation_score, f"Partial word match (similarity: {similarity:.0%})"
 
 
-def _recognize_speech_whisper(audio_path: str, target_word: str = "") -> Tuple[str, float]:
+def _recognize_speech_whisper(audio: np.ndarray, target_word: str = "") -> Tuple[str, float]:
     """
     Recognize speech using OpenAI Whisper (open-source, local).
     Uses multi-language fallback for better handling of Latin/English medical terms.
 
     Args:
-        audio_path: Path to audio file
+        audio: Mono float32 audio at 16 kHz (passed to Whisper directly)
         target_word: Optional target word for confidence calculation
 
     Returns:
@@ -625,13 +652,14 @@ def _recognize_speech_whisper(audio_path: str, target_word: str = "") -> Tuple[s
         # Strategy 1: Try with Turkish language (default for Turkish pronunciation tests)
         initial_prompt = f"Pronunciation test word: {target_word}" if target_word else ""
 
-        result_tr = model.transcribe(
-            audio_path,
-            language="tr",  # Turkish
-            task="transcribe",
-            fp16=False,  # CPU compatibility
-            initial_prompt=initial_prompt  # Help guide recognition
-        )
+        with _whisper_transcribe_lock:
+            result_tr = model.transcribe(
+                audio,
+                language="tr",  # Turkish
+                task="transcribe",
+                fp16=False,  # CPU compatibility
+                initial_prompt=initial_prompt  # Help guide recognition
+            )
 
         recognized_text = result_tr["text"].strip().lower()
         confidence = 0.85  # Default for successful recognition
@@ -657,12 +685,13 @@ def _recognize_speech_whisper(audio_path: str, target_word: str = "") -> Tuple[s
                 if char_similarity < 0.5 and (is_likely_latin or len(recognized_text) <= 3):
                     logger.info(f"Low similarity ({char_similarity:.2f}), trying multilingual detection...")
 
-                    result_multi = model.transcribe(
-                        audio_path,
-                        task="transcribe",
-                        fp16=False,
-                        initial_prompt=initial_prompt
-                    )
+                    with _whisper_transcribe_lock:
+                        result_multi = model.transcribe(
+                            audio,
+                            task="transcribe",
+                            fp16=False,
+                            initial_prompt=initial_prompt
+                        )
 
                     recognized_multi = result_multi["text"].strip().lower()
 
@@ -750,21 +779,19 @@ def _generate_phonemes_espeak(word: str, language: str = "tr") -> str:
 
 
 def _compute_phoneme_alignment_scores(
-    audio_path: str,
     target_phonemes: str,
     features: Dict,
     recognized_text: str
 ) -> Dict[str, float]:
     """
     Compute per-phoneme pronunciation scores using simplified alignment.
-    
+
     This uses a combination of:
     - Text matching (recognized vs target)
     - Acoustic feature analysis per phoneme
     - Temporal alignment estimation
-    
+
     Args:
-        audio_path: Path to audio file
         target_phonemes: Target phoneme sequence (space-separated)
         features: Extracted acoustic features
         recognized_text: Text recognized by speech recognition
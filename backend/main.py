@@ -1,16 +1,24 @@
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
-from pydantic import BaseModel
-from typing import Optional, List
-import json
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Annotated, Optional, List
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import io
 import os
+import tempfile
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
 import shutil
 import logging
 import librosa  # Still needed for audio format conversion
+import numpy as np
+import orjson
 import soundfile as sf  # For saving WAV files
 
 # Configure logging
@@ -25,7 +33,6 @@ from review_api import router as review_router
 
 # Import inference module
 from inference import analyze_pronunciation_whisper
-import requests
 
 app = FastAPI(title="Turkish Pronunciation Analysis API")
 
@@ -51,11 +58,101 @@ DATA_DIR = BASE_DIR / "data"
 # Ensure directories exist
 DATA_DIR.mkdir(exist_ok=True)
 
+# Scratch space for uploaded audio, created once at startup instead of per
+# request. Prefer tmpfs (/dev/shm) on Linux so the write/read/delete cycle
+# stays in memory; override with the PHT_TMP environment variable.
+TEMP_DIR = Path(os.environ.get(
+    "PHT_TMP",
+    "/dev/shm/phonetichybrid" if os.path.isdir("/dev/shm") else "temp_audio"
+))
+TEMP_DIR.mkdir(parents=True, exist_ok=True)
+
+# Worker pool for Whisper analysis. model.transcribe() processes one clip at a
+# time, so concurrent /analyze requests are handed to a small shared pool (all
+# workers reuse the one preloaded model) instead of blocking the event loop.
+ANALYSIS_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1),
+    thread_name_prefix="analyze"
+)
+
+# LRU cache of analysis results keyed by (audio content digest, word).
+# Re-uploading the same clip is common during review; hashing the bytes we
+# already hold in memory turns those repeats into a dict lookup instead of
+# a full Whisper + Praat pipeline run.
+_ANALYSIS_CACHE: OrderedDict = OrderedDict()
+_ANALYSIS_CACHE_MAX = 256
+
+
+def _analysis_cache_get(key):
+    """Look up a cached analysis result, refreshing its LRU position."""
+    result = _ANALYSIS_CACHE.get(key)
+    if result is not None:
+        _ANALYSIS_CACHE.move_to_end(key)
+    return result
+
+
+def _analysis_cache_put(key, result):
+    """Store an analysis result, evicting the oldest entries past the cap."""
+    _ANALYSIS_CACHE[key] = result
+    _ANALYSIS_CACHE.move_to_end(key)
+    while len(_ANALYSIS_CACHE) > _ANALYSIS_CACHE_MAX:
+        _ANALYSIS_CACHE.popitem(last=False)
+
 print("✓ PhoneticHybrid API - Using Whisper Speech Recognition")
 
+# Optionally load the Whisper model at import time. Under a preloading
+# process manager (gunicorn --preload, see scripts/start/start-backend-prod.sh)
+# the load happens once in the master process, so forked workers share the
+# read-only weights via copy-on-write instead of loading their own copies.
+if os.environ.get("PHT_PRELOAD_WHISPER") == "1":
+    import torch
+    if torch.cuda.is_available():
+        # Initializing CUDA in the master before fork leaves every
+        # worker with a broken inherited context (first transcribe
+        # fails), and device memory is not COW-shareable anyway - let
+        # each worker load the model onto the GPU itself after fork.
+        print("⚠ CUDA available - skipping Whisper preload; workers load the model after fork")
+    else:
+        from inference import _get_whisper_model
+        _get_whisper_model()
+
+
+def _atomic_write_json(path: Path, data: dict) -> None:
+    """
+    Serialize with orjson and write via temp file + rename.
+
+    orjson emits UTF-8 bytes directly (no Python-level text encoding), and
+    os.replace is atomic on the same filesystem, so a crash mid-write can
+    never leave a truncated JSON file behind.
+    """
+    blob = orjson.dumps(
+        data,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(blob)
+    os.replace(tmp_path, path)
+
+
+def _to_pcm16(y: np.ndarray) -> np.ndarray:
+    """
+    Convert float audio to int16 PCM with vectorized numpy ops.
+
+    Scaling and clipping in numpy runs at memory bandwidth and hands
+    libsndfile a buffer it can write verbatim, instead of letting it
+    convert sample by sample inside sf.write.
+    """
+    pcm = np.multiply(y, 32767.0, dtype=np.float32)
+    np.clip(pcm, -32768.0, 32767.0, out=pcm)
+    return pcm.astype(np.int16)
+
 
 # Pydantic models
+# frozen + extra="forbid" lets pydantic-core compile a strict, immutable
+# schema once instead of running the permissive default dispatch per request.
 class ParticipantInfo(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     name: str
     age: int
     gender: str
@@ -63,11 +160,16 @@ class ParticipantInfo(BaseModel):
 
 
 class SurveyResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     participant_id: str
-    responses: List[int]  # Likert scale responses (1-5)
+    # Likert scale responses (1-5)
+    responses: Annotated[List[int], Field(min_length=1, max_length=50)]
 
 
 class AnalysisResult(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     word: str
     score: float
     confidence: float
@@ -96,15 +198,14 @@ async def register_participant(info: ParticipantInfo):
     
     # Save participant info
     info_path = participant_dir / "info.json"
-    with open(info_path, "w", encoding="utf-8") as f:
-        json.dump({
-            "id": participant_id,
-            "name": info.name,
-            "age": info.age,
-            "gender": info.gender,
-            "consent": info.consent,
-            "timestamp": datetime.now().isoformat()
-        }, f, ensure_ascii=False, indent=2)
+    await asyncio.to_thread(_atomic_write_json, info_path, {
+        "id": participant_id,
+        "name": info.name,
+        "age": info.age,
+        "gender": info.gender,
+        "consent": info.consent,
+        "timestamp": datetime.now().isoformat()
+    })
     
     return {"participant_id": participant_id, "status": "registered"}
 
@@ -118,12 +219,11 @@ async def save_survey(survey: SurveyResponse):
         raise HTTPException(status_code=404, detail="Participant not found")
     
     survey_path = participant_dir / "survey.json"
-    with open(survey_path, "w", encoding="utf-8") as f:
-        json.dump({
-            "participant_id": survey.participant_id,
-            "responses": survey.responses,
-            "timestamp": datetime.now().isoformat()
-        }, f, ensure_ascii=False, indent=2)
+    await asyncio.to_thread(_atomic_write_json, survey_path, {
+        "participant_id": survey.participant_id,
+        "responses": survey.responses,
+        "timestamp": datetime.now().isoformat()
+    })
     
     return {"status": "survey_saved"}
 
@@ -145,26 +245,25 @@ async def upload_audio(
     words_dir = participant_dir / "kelimeler"
     words_dir.mkdir(exist_ok=True)
     
-    # Save temporary uploaded file
-    temp_dir = Path("temp_audio")
-    temp_dir.mkdir(exist_ok=True)
-    temp_path = temp_dir / f"temp_{uuid.uuid4()}.webm"
-    
+    temp_path = None
     try:
-        # Save uploaded file
-        with open(temp_path, "wb") as buffer:
+        # Stream the upload into the preallocated scratch directory;
+        # temp_path is bound before the copy so the finally below also
+        # cleans up after a client disconnect mid-upload
+        with tempfile.NamedTemporaryFile(dir=TEMP_DIR, suffix=".webm", delete=False) as buffer:
+            temp_path = Path(buffer.name)
             shutil.copyfileobj(audio.file, buffer)
-        
+
         # Convert to proper WAV format using librosa
         audio_path = words_dir / f"{word_index:02d}_{word}.wav"
         y, sr = librosa.load(str(temp_path), sr=16000)
-        
+
         # Save as proper WAV file
-        sf.write(str(audio_path), y, sr, subtype='PCM_16')
-        
+        sf.write(str(audio_path), _to_pcm16(y), sr, subtype='PCM_16')
+
     finally:
         # Clean up temp file
-        if temp_path.exists():
+        if temp_path is not None and temp_path.exists():
             temp_path.unlink()
     
     # This endpoint is deprecated - recordings are now analyzed via /analyze
@@ -178,9 +277,8 @@ async def upload_audio(
     
     # Save analysis result
     result_path = words_dir / f"{word_index:02d}_{word}_result.json"
-    with open(result_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
-    
+    await asyncio.to_thread(_atomic_write_json, result_path, result)
+
     return result
 
 
@@ -201,14 +299,19 @@ async def serve_audio(participant_id: str, filename: str):
         Audio file
     """
     audio_path = DATA_DIR / participant_id / "kelimeler" / filename
-    
-    if not audio_path.exists():
+
+    # Stat once and hand the result to FileResponse so Starlette doesn't
+    # stat the file a second time; the transfer itself uses sendfile(2).
+    try:
+        stat_result = os.stat(audio_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Audio file not found")
-    
+
     return FileResponse(
         path=str(audio_path),
         media_type="audio/wav",
-        filename=filename
+        filename=filename,
+        stat_result=stat_result
     )
 
 
@@ -278,66 +381,67 @@ async def analyze_endpoint(
         else:
             permanent_audio_path = None
 
-        # Save uploaded file temporarily for processing
-        temp_dir = Path("temp_audio")
-        temp_dir.mkdir(exist_ok=True)
-
-        # Save raw upload first
-        raw_temp_path = temp_dir / f"{uuid.uuid4()}_raw.wav"
-        final_temp_path = temp_dir / f"{uuid.uuid4()}.wav"
+        content = await file.read()
 
-        with open(raw_temp_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        # Check the content-addressed cache before any decode work.
+        cache_key = (hashlib.blake2b(content, digest_size=16).hexdigest(), word)
+        cached_result = _analysis_cache_get(cache_key)
+        if cached_result is not None and not save_permanently:
+            logger.info(f"Analysis cache hit for word='{word}'")
+            return cached_result
 
-        # Convert to proper WAV format (16-bit PCM, 16kHz)
-        # This ensures compatibility with Whisper, Praat, and librosa
+        # Decode the upload once, entirely in memory (16 kHz mono float32).
+        # soundfile parses WAV straight from the buffer; fall back to
+        # librosa/audioread via a scratch file for anything else.
         try:
-            import soundfile as sf
             import warnings
 
-            # Suppress the PySoundFile warning since we handle the fallback
             with warnings.catch_warnings():
                 warnings.filterwarnings("ignore", message="PySoundFile failed")
                 warnings.filterwarnings("ignore", category=FutureWarning, module="librosa")
-                y, sr = librosa.load(str(raw_temp_path), sr=16000)
-
-            sf.write(str(final_temp_path), y, 16000, subtype='PCM_16')
-            logger.info(f"Audio converted to proper WAV format: {final_temp_path}")
-
-            # If we need to save permanently, copy the converted file
-            if permanent_audio_path:
-                import shutil
-                shutil.copy2(str(final_temp_path), str(permanent_audio_path))
-                logger.info(f"Audio saved permanently to: {permanent_audio_path}")
-
+                y, sr = sf.read(io.BytesIO(content), dtype='float32', always_2d=False)
+            if y.ndim > 1:
+                y = y.mean(axis=1)
+            if sr != 16000:
+                y = librosa.resample(y, orig_sr=sr, target_sr=16000)
         except Exception as e:
-            logger.error(f"Audio conversion failed: {e}")
-            # If conversion fails, try using the raw file
-            final_temp_path = raw_temp_path
-
-        # Analyze pronunciation using Whisper hybrid approach
-        result = analyze_pronunciation_whisper(
-            audio_path=str(final_temp_path),
-            word=word
-        )
+            logger.warning(f"In-memory decode failed ({e}), retrying via librosa")
+            with tempfile.NamedTemporaryFile(
+                dir=TEMP_DIR, suffix="_raw.wav", delete=False
+            ) as f:
+                f.write(content)
+                raw_temp_path = Path(f.name)
+            try:
+                y, sr = librosa.load(str(raw_temp_path), sr=16000)
+            finally:
+                raw_temp_path.unlink(missing_ok=True)
+
+        # Persist the converted audio if a participant folder was given
+        if permanent_audio_path:
+            sf.write(str(permanent_audio_path), _to_pcm16(y), 16000, subtype='PCM_16')
+            logger.info(f"Audio saved permanently to: {permanent_audio_path}")
+
+        # Analyze pronunciation using Whisper hybrid approach.
+        # Run in the shared worker pool so the event loop stays free to
+        # accept other requests while Whisper and Praat do their work.
+        if cached_result is not None:
+            logger.info(f"Analysis cache hit for word='{word}'")
+            result = cached_result
+        else:
+            result = await asyncio.get_running_loop().run_in_executor(
+                ANALYSIS_EXECUTOR,
+                analyze_pronunciation_whisper,
+                y,
+                word
+            )
+            _analysis_cache_put(cache_key, result)
 
         # Save analysis result if participant info provided
         if permanent_audio_path and word_index is not None:
             result_path = permanent_audio_path.parent / f"{word_index:02d}_{word}_result.json"
-            with open(result_path, "w", encoding="utf-8") as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+            await asyncio.to_thread(_atomic_write_json, result_path, result)
             logger.info(f"Analysis result saved to: {result_path}")
 
-        # Clean up temporary files
-        try:
-            if raw_temp_path.exists():
-                raw_temp_path.unlink()
-            if final_temp_path.exists() and final_temp_path != raw_temp_path:
-                final_temp_path.unlink()
-        except:
-            pass
-
         return result
 
     except ImportError as e:
@@ -356,6 +460,25 @@ async def analyze_endpoint(
         )
 
 
+# Participant count for /health, refreshed at most every 30s so bursts of
+# liveness probes don't re-walk the data directory.
+_participant_count_cache = (0.0, 0)
+
+
+def _count_participants() -> int:
+    """Count participant directories via one scandir pass, cached for 30s."""
+    global _participant_count_cache
+    cached_at, count = _participant_count_cache
+    now = time.monotonic()
+    if now - cached_at > 30.0 or cached_at == 0.0:
+        count = sum(
+            1 for e in os.scandir(DATA_DIR)
+            if e.name.startswith("participant_") and e.is_dir(follow_symlinks=False)
+        )
+        _participant_count_cache = (now, count)
+    return count
+
+
 @app.get("/health")
 async def health_check():
     """
@@ -373,7 +496,7 @@ async def health_check():
         "status": "healthy",
         "whisper_available": whisper_available,
         "data_dir": str(DATA_DIR),
-        "participants": len(list(DATA_DIR.glob("participant_*"))),
+        "participants": _count_participants(),
         "analysis_method": "Whisper (OpenAI) + Phoneme Analysis"
     }
 
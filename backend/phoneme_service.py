@@ -4,11 +4,15 @@ Uses Phonemizer library with eSpeak-NG backend
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Optional
+import asyncio
+import functools
 import logging
 import os
 import platform
+import shutil
 import subprocess
 
 # Configure logging
@@ -48,41 +52,21 @@ try:
                 logger.info(f"✓ Set PHONEMIZER_ESPEAK_LIBRARY to: {lib_path}")
                 break
 
-    if platform.system() == 'Windows':
-        # Find eSpeak-NG executable
-        espeak_dir = r"C:\Program Files\eSpeak NG"
-        espeak_exe = os.path.join(espeak_dir, "espeak-ng.exe")
+    # Locate the executable without spawning it: shutil.which is a pure
+    # PATH scan, so importing this module (uvicorn startup, pytest
+    # collection) no longer blocks on an espeak --version round-trip.
+    # Version probing is deferred to the first /phoneme/health call.
+    espeak_exe_path = shutil.which('espeak-ng')
+    if espeak_exe_path is None and platform.system() == 'Windows':
+        default_exe = r"C:\Program Files\eSpeak NG\espeak-ng.exe"
+        if os.path.exists(default_exe):
+            espeak_exe_path = default_exe
 
-        if os.path.exists(espeak_exe):
-            espeak_exe_path = espeak_exe
-            logger.info(f"✓ Found eSpeak-NG at: {espeak_exe}")
-
-            # Test if it works
-            result = subprocess.run(
-                [espeak_exe, "--version"],
-                capture_output=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                phonemizer_available = True
-                version_info = result.stdout.decode('utf-8', errors='ignore').strip().split('\n')[0]
-                logger.info("✓ eSpeak-NG is working and available for phoneme generation")
-                logger.info(f"✓ Version: {version_info}")
-            else:
-                logger.warning("⚠ eSpeak-NG found but not responding correctly")
-        else:
-            logger.warning(f"⚠ eSpeak-NG not found at: {espeak_exe}")
+    if espeak_exe_path is not None:
+        phonemizer_available = True
+        logger.info(f"✓ Found eSpeak-NG at: {espeak_exe_path}")
     else:
-        # Linux/Mac: Check if espeak-ng is in PATH
-        result = subprocess.run(
-            ["espeak-ng", "--version"],
-            capture_output=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            phonemizer_available = True
-            espeak_exe_path = "espeak-ng"
-            logger.info("✓ eSpeak-NG is available")
+        logger.warning("⚠ eSpeak-NG not found on PATH")
 
 except Exception as e:
     logger.warning(f"⚠ Could not initialize eSpeak-NG: {e}")
@@ -90,6 +74,128 @@ except Exception as e:
     phonemizer_available = False
 
 
+# In-process eSpeak-NG binding via phonemizer. Loading libespeak-ng once
+# and calling it in-process avoids the fork/exec/voice-load cost that
+# dominates the subprocess path; backends are created lazily per stress
+# setting and cached for the life of the process.
+_espeak_backends = {}
+
+
+def _get_espeak_backend(with_stress: bool):
+    """
+    Lazily create (and cache) a phonemizer EspeakBackend.
+
+    Returns None when the library cannot be loaded; callers then fall
+    back to the espeak-ng subprocess.
+    """
+    if with_stress not in _espeak_backends:
+        try:
+            from phonemizer.backend import EspeakBackend
+            _espeak_backends[with_stress] = EspeakBackend(
+                'tr',
+                preserve_punctuation=False,
+                with_stress=with_stress
+            )
+            logger.info(f"✓ phonemizer EspeakBackend ready (with_stress={with_stress})")
+        except Exception as e:
+            logger.warning(f"⚠ phonemizer EspeakBackend unavailable, using subprocess: {e}")
+            _espeak_backends[with_stress] = None
+    return _espeak_backends[with_stress]
+
+
+async def _run_espeak(*args, input_bytes: Optional[bytes] = None, timeout: float = 5.0):
+    """
+    Run espeak-ng without blocking the event loop.
+
+    Returns (returncode, stdout, stderr); kills the process on timeout
+    so a hung espeak cannot leak.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        espeak_exe_path, *args,
+        stdin=asyncio.subprocess.PIPE if input_bytes is not None else None,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            proc.communicate(input_bytes), timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        proc.kill()
+        raise
+    return proc.returncode, stdout, stderr
+
+
+# Mirrors _phonemize_cached for the async subprocess fallback, where
+# lru_cache cannot wrap an awaited call
+_subprocess_cache = {}
+
+
+def _lower_tr(word: str) -> str:
+    """
+    Turkish-aware lowercasing.
+
+    Default Unicode case mapping breaks the dotted/dotless-i pairs:
+    'IŞIK'.casefold() gives 'işik' (wrong phonemes, /i/ for /ɯ/) and
+    'İstanbul' picks up a stray combining dot. Map İ→i and I→ı first so
+    espeak sees the same word a Turkish speaker would write.
+    """
+    return word.replace('İ', 'i').replace('I', 'ı').lower()
+
+
+async def _phonemize_word(word: str, include_stress: bool = True) -> str:
+    """
+    Generate the raw IPA string for one word.
+
+    Normalizes the word so 'Pencere', 'pencere ' and 'PENCERE' share one
+    cache entry, prefers the in-process libespeak-ng binding, and falls
+    back to an espeak-ng subprocess run asynchronously so the event
+    loop keeps serving other requests during the call.
+    """
+    word = _lower_tr(word.strip())
+
+    if _get_espeak_backend(include_stress) is not None:
+        return _phonemize_cached(word, include_stress)
+
+    key = (word, include_stress)
+    cached = _subprocess_cache.get(key)
+    if cached is not None:
+        return cached
+
+    # Subprocess fallback:
+    # -v tr = Turkish voice, -q = quiet (no audio), --ipa = IPA phonemes
+    returncode, stdout, stderr = await _run_espeak("-v", "tr", "-q", "--ipa", word)
+
+    if returncode != 0:
+        error_msg = stderr.decode('utf-8', errors='ignore') if stderr else 'Unknown error'
+        raise RuntimeError(f"eSpeak-NG returned error: {error_msg}")
+
+    # One pass over the raw bytes: bytes.split() tokenizes on any ASCII
+    # whitespace (including \r\n), then each token is decoded exactly once
+    raw = ' '.join(t.decode('utf-8', errors='ignore') for t in stdout.split())
+    if len(_subprocess_cache) < 1024:
+        _subprocess_cache[key] = raw
+    return raw
+
+
+@functools.lru_cache(maxsize=1024)
+def _phonemize_cached(word: str, include_stress: bool) -> str:
+    """
+    Cached word -> raw IPA lookup through the in-process backend.
+
+    The word list is small and mostly static, so after warmup nearly
+    every request is a dictionary hit instead of an espeak call.
+    Exceptions are not cached by lru_cache, so transient espeak
+    failures do not poison the cache.
+    """
+    return _get_espeak_backend(include_stress).phonemize([word], strip=True)[0]
+
+
+# Turkish vowels in IPA, built once - syllable estimation checks every
+# phoneme of every analyzed word against this set
+_TR_IPA_VOWELS = frozenset('aeɛioœuyɯø')
+
+
 # Pydantic models
 class PhonemeRequest(BaseModel):
     """Request model for phoneme generation"""
@@ -119,7 +225,11 @@ class PhonemeAnalysis(BaseModel):
 
 # API Endpoints
 
-@router.post("/generate", response_model=PhonemeResponse)
+# response_class=ORJSONResponse returns the dict as-is through orjson,
+# skipping per-response Pydantic model construction and validation; the
+# responses= entry keeps the model in the OpenAPI schema
+@router.post("/generate", response_class=ORJSONResponse,
+             responses={200: {"model": PhonemeResponse}})
 async def generate_phonemes(request: PhonemeRequest):
     """
     Generate IPA phoneme sequence for a Turkish word.
@@ -170,47 +280,25 @@ async def generate_phonemes(request: PhonemeRequest):
         # Clean input
         word = request.word.strip()
         
-        # Call eSpeak-NG directly using subprocess
-        # -v tr = Turkish voice
-        # -q = quiet (no audio)
-        # --ipa = output IPA phonemes
-        result = subprocess.run(
-            [espeak_exe_path, "-v", "tr", "-q", "--ipa", word],
-            capture_output=True,
-            timeout=5
-        )
-        
-        if result.returncode != 0:
-            error_msg = result.stderr.decode('utf-8', errors='ignore') if result.stderr else 'Unknown error'
-            raise Exception(f"eSpeak-NG returned error: {error_msg}")
-        
-        # Decode output as UTF-8 bytes (more reliable on Windows)
-        phonemes_raw = result.stdout.decode('utf-8', errors='ignore').strip()
-        
-        # Split into individual phonemes and join with specified separator
-        # eSpeak-NG already provides IPA symbols
-        phoneme_list = [p.strip() for p in phonemes_raw if p.strip() and p not in ['\n', '\r', '\t']]
-        
-        # Join with separator if requested
-        if request.separator:
-            phonemes = request.separator.join(phonemes_raw.replace('\n', '').replace('\r', '').strip().split())
-        else:
-            phonemes = phonemes_raw.replace('\n', ' ').replace('\r', '').strip()
-        
-        # Count actual phonemes (split by space)
-        phoneme_count = len([p for p in phonemes.split() if p])
+        phonemes_raw = await _phonemize_word(word, request.include_stress)
+
+        # Single tokenization pass: split() already drops \r\n\t, the
+        # separator join and the count reuse the same token list
+        tokens = phonemes_raw.split()
+        phonemes = (request.separator or ' ').join(tokens)
+        phoneme_count = len(tokens)
         
         logger.info(f"Generated phonemes for '{word}': {phonemes}")
-        
-        return PhonemeResponse(
-            word=word,
-            phonemes=phonemes,
-            phoneme_count=phoneme_count,
-            language="tr",
-            backend="espeak-ng"
-        )
+
+        return {
+            "word": word,
+            "phonemes": phonemes,
+            "phoneme_count": phoneme_count,
+            "language": "tr",
+            "backend": "espeak-ng"
+        }
     
-    except subprocess.TimeoutExpired:
+    except (subprocess.TimeoutExpired, asyncio.TimeoutError):
         logger.error(f"eSpeak-NG timeout for word: {request.word}")
         raise HTTPException(
             status_code=500,
@@ -224,7 +312,8 @@ async def generate_phonemes(request: PhonemeRequest):
         )
 
 
-@router.post("/analyze", response_model=PhonemeAnalysis)
+@router.post("/analyze", response_class=ORJSONResponse,
+             responses={200: {"model": PhonemeAnalysis}})
 async def analyze_phonemes(request: PhonemeRequest):
     """
     Detailed phoneme analysis for a Turkish word.
@@ -246,36 +335,25 @@ async def analyze_phonemes(request: PhonemeRequest):
     try:
         word = request.word.strip()
         
-        # Call eSpeak-NG directly
-        result = subprocess.run(
-            [espeak_exe_path, "-v", "tr", "-q", "--ipa", word],
-            capture_output=True,
-            timeout=5
-        )
-        
-        if result.returncode != 0:
-            error_msg = result.stderr.decode('utf-8', errors='ignore') if result.stderr else 'Unknown error'
-            raise Exception(f"eSpeak-NG error: {error_msg}")
-        
-        phonemes_raw = result.stdout.decode('utf-8', errors='ignore').strip()
-        phonemes = request.separator.join(phonemes_raw.replace('\n', '').replace('\r', '').strip().split())
-        
+        phonemes_raw = await _phonemize_word(word, request.include_stress)
+        # str.split() with no args already swallows \r\n, so one pass does
+        phonemes = request.separator.join(phonemes_raw.split())
+
         # Parse phoneme list
         phoneme_list = [p for p in phonemes.split(request.separator) if p]
         phoneme_count = len(phoneme_list)
         
-        # Estimate syllables (count vowels in IPA)
-        turkish_vowels = set('aeɛioœuyɯø')
-        syllable_estimate = sum(1 for p in phoneme_list if any(v in p for v in turkish_vowels))
+        # Estimate syllables (count vowel-bearing phonemes in IPA)
+        syllable_estimate = sum(1 for p in phoneme_list if not _TR_IPA_VOWELS.isdisjoint(p))
         
-        return PhonemeAnalysis(
-            word=word,
-            phonemes=phonemes,
-            phoneme_list=phoneme_list,
-            phoneme_count=phoneme_count,
-            syllable_estimate=syllable_estimate,
-            language="tr"
-        )
+        return {
+            "word": word,
+            "phonemes": phonemes,
+            "phoneme_list": phoneme_list,
+            "phoneme_count": phoneme_count,
+            "syllable_estimate": syllable_estimate,
+            "language": "tr"
+        }
     
     except Exception as e:
         logger.error(f"Phoneme analysis failed for '{request.word}': {e}")
@@ -285,6 +363,40 @@ async def analyze_phonemes(request: PhonemeRequest):
         )
 
 
+@router.post("/cache/clear")
+async def clear_phoneme_cache():
+    """Clear the cached word -> IPA results (e.g. after an espeak upgrade)"""
+    info = _phonemize_cached.cache_info()
+    _phonemize_cached.cache_clear()
+    entries = info.currsize + len(_subprocess_cache)
+    _subprocess_cache.clear()
+    return {
+        "status": "cleared",
+        "entries": entries,
+        "hits": info.hits,
+        "misses": info.misses
+    }
+
+
+# Memoized on first success so repeat health checks are O(1); failures
+# are not memoized and get re-probed
+_espeak_version_line = None
+
+
+async def _espeak_version() -> str:
+    """Probe espeak-ng for its version line, caching the first success."""
+    global _espeak_version_line
+    if _espeak_version_line is None:
+        try:
+            returncode, stdout, _ = await _run_espeak("--version")
+            if returncode != 0:
+                return "unknown"
+            _espeak_version_line = stdout.decode('utf-8', errors='ignore').strip().split('\n')[0]
+        except Exception:
+            return "unknown"
+    return _espeak_version_line
+
+
 @router.get("/health")
 async def health_check():
     """Check if phoneme service is available"""
@@ -294,30 +406,17 @@ async def health_check():
             "backend": "espeak-ng",
             "message": "eSpeak-NG not initialized"
         }
-    
-    # Get version from espeak-ng
-    try:
-        result = subprocess.run(
-            [espeak_exe_path, "--version"],
-            capture_output=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            version_line = result.stdout.decode('utf-8', errors='ignore').strip().split('\n')[0]
-        else:
-            version_line = "unknown"
-    except:
-        version_line = "unknown"
-    
+
     return {
         "status": "available",
         "backend": "espeak-ng",
         "language": "tr",
-        "version": version_line
+        "version": await _espeak_version()
     }
 
 
-@router.post("/batch", response_model=list[PhonemeResponse])
+@router.post("/batch", response_class=ORJSONResponse,
+             responses={200: {"model": list[PhonemeResponse]}})
 async def generate_batch_phonemes(words: list[str]):
     """
     Generate phonemes for multiple words at once.
@@ -343,32 +442,69 @@ async def generate_batch_phonemes(words: list[str]):
         )
     
     try:
-        results = []
-        
-        for word in words:
-            if not word.strip():
-                continue
-            
-            # Call eSpeak-NG for each word
-            result = subprocess.run(
-                [espeak_exe_path, "-v", "tr", "-q", "--ipa", word.strip()],
-                capture_output=True,
-                timeout=5
+        clean_words = [w.strip() for w in words if w.strip()]
+        if not clean_words:
+            return []
+
+        if _get_espeak_backend(with_stress=True) is not None:
+            # Route each word through the cached helper: the 30-word test
+            # list is mostly static, so repeat batches are pure cache hits
+            lines = [(await _phonemize_word(w)).strip() for w in clean_words]
+        else:
+            # One eSpeak-NG invocation for the whole batch: words go in on
+            # stdin one per line and espeak emits one IPA line per utterance,
+            # collapsing N fork/exec/voice-load cycles into a single call
+            returncode, stdout, _ = await _run_espeak(
+                "-v", "tr", "-q", "--ipa",
+                input_bytes="\n".join(clean_words).encode('utf-8'),
+                timeout=5 + 0.1 * len(clean_words)
             )
-            
-            if result.returncode == 0:
-                phonemes_raw = result.stdout.decode('utf-8', errors='ignore').strip()
-                phonemes = ' '.join(phonemes_raw.replace('\n', '').replace('\r', '').strip().split())
+
+            lines = []
+            if returncode == 0:
+                # Tokenize each line at the bytes level (split() also eats
+                # \r on Windows) and decode the joined result once
+                lines = [
+                    b' '.join(ln.split()).decode('utf-8', errors='ignore')
+                    for ln in stdout.splitlines() if ln.strip()
+                ]
+
+        results = []
+
+        if len(lines) == len(clean_words):
+            for word, phonemes_raw in zip(clean_words, lines):
+                phonemes = ' '.join(phonemes_raw.split())
                 phoneme_list = [p for p in phonemes.split(' ') if p]
-                
-                results.append(PhonemeResponse(
-                    word=word.strip(),
-                    phonemes=phonemes,
-                    phoneme_count=len(phoneme_list),
-                    language="tr",
-                    backend="espeak-ng"
-                ))
-        
+
+                results.append({
+                    "word": word,
+                    "phonemes": phonemes,
+                    "phoneme_count": len(phoneme_list),
+                    "language": "tr",
+                    "backend": "espeak-ng"
+                })
+        else:
+            # Output didn't line up 1:1 with the input (e.g. a word
+            # produced a blank line) - fall back to one call per word
+            logger.warning("Batch espeak output mismatch, falling back to per-word calls")
+            for word in clean_words:
+                try:
+                    phonemes_raw = await _phonemize_word(word)
+                except Exception as e:
+                    logger.warning(f"Skipping '{word}' in batch: {e}")
+                    continue
+
+                phonemes = ' '.join(phonemes_raw.split())
+                phoneme_list = [p for p in phonemes.split(' ') if p]
+
+                results.append({
+                    "word": word,
+                    "phonemes": phonemes,
+                    "phoneme_count": len(phoneme_list),
+                    "language": "tr",
+                    "backend": "espeak-ng"
+                })
+
         return results
     
     except Exception as e:
@@ -8,8 +8,13 @@ from pydantic import BaseModel
 from typing import List, Optional, Dict
 from pathlib import Path
 from datetime import datetime
+import asyncio
+import functools
 import json
 import logging
+import orjson
+import os
+import time
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,6 +25,16 @@ router = APIRouter(prefix="/review", tags=["review"])
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
+# The /review/stats scan is O(files); cache the aggregate briefly and
+# clear it whenever a label is written or deleted, so evaluators still
+# see their own changes immediately
+_STATS_TTL_SECONDS = 10.0
+_stats_cache = {"value": None, "computed_at": 0.0}
+
+
+def _invalidate_stats_cache():
+    _stats_cache["value"] = None
+
 
 class LabelData(BaseModel):
     """Label/score data for a recording"""
@@ -55,63 +70,98 @@ class RecordingInfo(BaseModel):
     timestamp: Optional[str] = None
 
 
+def _count_recordings(participant_path: str) -> tuple:
+    """
+    Count recordings and labels in one scandir pass.
+
+    The directory listing itself says which _result.json files exist,
+    so there is no per-file exists()/stat call.
+
+    Returns:
+        Tuple of (total_recordings, labeled_recordings)
+    """
+    wav_stems = []
+    result_stems = set()
+    try:
+        with os.scandir(os.path.join(participant_path, "kelimeler")) as it:
+            for entry in it:
+                name = entry.name
+                if name.endswith('.wav'):
+                    wav_stems.append(name[:-4])
+                elif name.endswith('_result.json'):
+                    result_stems.add(name[:-len('_result.json')])
+    except FileNotFoundError:
+        pass
+
+    total = len(wav_stems)
+    labeled = sum(1 for stem in wav_stems if stem in result_stems)
+    return total, labeled
+
+
+@functools.lru_cache(maxsize=4096)
+def _load_info(path_str: str, mtime_ns: int) -> dict:
+    """
+    Parse an info.json once per (path, mtime).
+
+    Rewriting the file changes the mtime, which misses the cache and
+    re-parses - so invalidation is automatic and warm listings read
+    nothing from disk beyond the stat.
+    """
+    return orjson.loads(Path(path_str).read_bytes())
+
+
+def _summarize_participant(participant_path: str, participant_id: str) -> ParticipantSummary:
+    """Build the summary for one participant (runs in a worker thread)."""
+    total_recordings, labeled_recordings = _count_recordings(participant_path)
+
+    survey_completed = os.path.exists(os.path.join(participant_path, "survey.json"))
+
+    registration_date = None
+    info_path = os.path.join(participant_path, "info.json")
+    try:
+        st = os.stat(info_path)
+        registration_date = _load_info(info_path, st.st_mtime_ns).get('timestamp')
+    except:
+        pass
+
+    return ParticipantSummary(
+        participant_id=participant_id,
+        total_recordings=total_recordings,
+        labeled_recordings=labeled_recordings,
+        unlabeled_recordings=total_recordings - labeled_recordings,
+        registration_date=registration_date,
+        survey_completed=survey_completed
+    )
+
+
 @router.get("/participants", response_model=List[ParticipantSummary])
 async def list_participants():
     """
     Get list of all participants with summary information.
-    
+
     Returns:
         List of participant summaries with recording counts
     """
     if not DATA_DIR.exists():
         return []
-    
-    participants = []
-    
-    for participant_dir in DATA_DIR.glob("participant_*"):
-        participant_id = participant_dir.name
-        
-        # Count recordings
-        kelimeler_dir = participant_dir / "kelimeler"
-        total_recordings = 0
-        labeled_recordings = 0
-        
-        if kelimeler_dir.exists():
-            wav_files = list(kelimeler_dir.glob("*.wav"))
-            total_recordings = len(wav_files)
-            
-            for wav_file in wav_files:
-                result_file = wav_file.parent / f"{wav_file.stem}_result.json"
-                if result_file.exists():
-                    labeled_recordings += 1
-        
-        # Check for survey data
-        survey_file = participant_dir / "survey.json"
-        survey_completed = survey_file.exists()
-        
-        # Get registration info
-        registration_file = participant_dir / "info.json"
-        registration_date = None
-        if registration_file.exists():
-            try:
-                with open(registration_file, 'r', encoding='utf-8') as f:
-                    info = json.load(f)
-                    registration_date = info.get('timestamp')
-            except:
-                pass
-        
-        participants.append(ParticipantSummary(
-            participant_id=participant_id,
-            total_recordings=total_recordings,
-            labeled_recordings=labeled_recordings,
-            unlabeled_recordings=total_recordings - labeled_recordings,
-            registration_date=registration_date,
-            survey_completed=survey_completed
-        ))
-    
+
+    # One scandir over the data dir, then the per-participant scans and
+    # info.json reads fan out to threads so the event loop never blocks
+    # on disk and slow (e.g. network) storage is read concurrently
+    with os.scandir(DATA_DIR) as it:
+        participant_dirs = [
+            (entry.path, entry.name) for entry in it
+            if entry.name.startswith("participant_") and entry.is_dir()
+        ]
+
+    participants = list(await asyncio.gather(*(
+        asyncio.to_thread(_summarize_participant, path, name)
+        for path, name in participant_dirs
+    )))
+
     # Sort by most recent first
     participants.sort(key=lambda p: p.registration_date or "", reverse=True)
-    
+
     return participants
 
 
@@ -150,33 +200,45 @@ async def get_participant_details(participant_id: str):
     recordings = []
     
     if kelimeler_dir.exists():
-        for wav_file in sorted(kelimeler_dir.glob("*.wav")):
-            result_file = wav_file.parent / f"{wav_file.stem}_result.json"
-            
-            labeled = result_file.exists()
+        # One scandir pass classifies recordings and labels together -
+        # the listing replaces the per-wav exists() call on the sibling
+        # _result.json
+        wav_names = []
+        result_stems = set()
+        with os.scandir(kelimeler_dir) as it:
+            for entry in it:
+                name = entry.name
+                if name.endswith('.wav'):
+                    wav_names.append(name)
+                elif name.endswith('_result.json'):
+                    result_stems.add(name[:-len('_result.json')])
+
+        for wav_name in sorted(wav_names):
+            stem = wav_name[:-4]
+            labeled = stem in result_stems
             score = None
             evaluator = None
             notes = None
             timestamp = None
-            
+
             if labeled:
+                result_file = kelimeler_dir / f"{stem}_result.json"
                 try:
-                    with open(result_file, 'r', encoding='utf-8') as f:
-                        result = json.load(f)
-                        score = result.get('score')
-                        evaluator = result.get('evaluator')
-                        notes = result.get('notes')
-                        timestamp = result.get('timestamp')
+                    result = orjson.loads(result_file.read_bytes())
+                    score = result.get('score')
+                    evaluator = result.get('evaluator')
+                    notes = result.get('notes')
+                    timestamp = result.get('timestamp')
                 except Exception as e:
                     logger.error(f"Error reading result file {result_file}: {e}")
-            
+
             # Extract word from filename (e.g., "01_araba.wav" -> "araba")
-            word = wav_file.stem.split('_', 1)[1] if '_' in wav_file.stem else wav_file.stem
-            
+            word = stem.split('_', 1)[1] if '_' in stem else stem
+
             recordings.append(RecordingInfo(
-                filename=wav_file.name,
+                filename=wav_name,
                 word=word,
-                audio_path=f"/audio/{participant_id}/{wav_file.name}",
+                audio_path=f"/audio/{participant_id}/{wav_name}",
                 labeled=labeled,
                 score=score,
                 evaluator=evaluator,
@@ -240,13 +302,18 @@ async def save_label(participant_id: str, filename: str, label: LabelData):
         "specific_issues": label.specific_issues
     }
     
-    # Save to file
+    # Save to file - orjson serializes in C and the bytes go out in one
+    # write; same schema and indentation as the old stdlib json path
     try:
-        with open(result_file, 'w', encoding='utf-8') as f:
-            json.dump(label_data, f, ensure_ascii=False, indent=2)
-        
+        result_file.write_bytes(orjson.dumps(
+            label_data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ))
+
+
         logger.info(f"Label saved: {result_file} (score: {label.score})")
-        
+        _invalidate_stats_cache()
+
         return {
             "success": True,
             "message": "Label saved successfully",
@@ -286,8 +353,7 @@ async def get_label(participant_id: str, filename: str):
         return {"labeled": False}
     
     try:
-        with open(result_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return orjson.loads(result_file.read_bytes())
     except Exception as e:
         logger.error(f"Error reading label: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to read label: {str(e)}")
@@ -317,6 +383,7 @@ async def delete_label(participant_id: str, filename: str):
     if result_file.exists():
         try:
             result_file.unlink()
+            _invalidate_stats_cache()
             return {"success": True, "message": "Label deleted"}
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to delete label: {str(e)}")
@@ -341,26 +408,35 @@ async def get_labeling_stats():
             "labeling_progress": 0
         }
     
+    # Same scandir-based counting as /participants, off the event loop,
+    # and served from the TTL cache on repeat requests
+    now = time.monotonic()
+    if (_stats_cache["value"] is None
+            or now - _stats_cache["computed_at"] > _STATS_TTL_SECONDS):
+        _stats_cache["value"] = await asyncio.to_thread(_compute_stats)
+        _stats_cache["computed_at"] = now
+
+    return _stats_cache["value"]
+
+
+def _compute_stats() -> Dict:
+    """Walk the data dir once and aggregate global labeling counts."""
     total_participants = 0
     total_recordings = 0
     labeled_recordings = 0
-    
-    for participant_dir in DATA_DIR.glob("participant_*"):
-        total_participants += 1
-        
-        kelimeler_dir = participant_dir / "kelimeler"
-        if kelimeler_dir.exists():
-            wav_files = list(kelimeler_dir.glob("*.wav"))
-            total_recordings += len(wav_files)
-            
-            for wav_file in wav_files:
-                result_file = wav_file.parent / f"{wav_file.stem}_result.json"
-                if result_file.exists():
-                    labeled_recordings += 1
-    
+
+    with os.scandir(DATA_DIR) as it:
+        for entry in it:
+            if not (entry.name.startswith("participant_") and entry.is_dir()):
+                continue
+            total_participants += 1
+            total, labeled = _count_recordings(entry.path)
+            total_recordings += total
+            labeled_recordings += labeled
+
     unlabeled_recordings = total_recordings - labeled_recordings
     progress = (labeled_recordings / total_recordings * 100) if total_recordings > 0 else 0
-    
+
     return {
         "total_participants": total_participants,
         "total_recordings": total_recordings,
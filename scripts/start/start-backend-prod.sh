@@ -0,0 +1,37 @@
+#!/bin/bash
+
+# ============================================
+# PhoneticHybrid Production Backend - Linux
+# ============================================
+#
+# Runs the backend under gunicorn with multiple uvicorn workers.
+# --preload imports the app once in the master process before forking,
+# and PHT_PRELOAD_WHISPER=1 makes that import load the Whisper model,
+# so every worker shares the read-only weights via copy-on-write pages
+# instead of each loading its own copy. On CUDA hosts the preload is
+# skipped automatically (a CUDA context must not be created before
+# fork) and each worker loads the model onto the GPU itself.
+
+if [ ! -d "backend/venv" ]; then
+    echo "Error: Backend virtual environment not found!"
+    echo "Please run the setup script first:"
+    echo "  ./scripts/setup/setup-linux.sh"
+    exit 1
+fi
+
+# One worker per physical core by default; override with WORKERS=n
+WORKERS="${WORKERS:-$(nproc)}"
+
+# Keep BLAS/OpenMP at one thread per worker - the workers provide the
+# parallelism, and oversubscribing cores slows torch down.
+export OMP_NUM_THREADS=1
+export MKL_NUM_THREADS=1
+export PHT_PRELOAD_WHISPER=1
+
+cd backend
+source venv/bin/activate
+exec gunicorn main:app \
+    -k uvicorn.workers.UvicornWorker \
+    -w "$WORKERS" \
+    --preload \
+    --bind 0.0.0.0:8000